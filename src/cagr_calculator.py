@@ -1,10 +1,13 @@
 import pandas as pd
 import numpy as np
 import os
+import logging
 from datetime import datetime, timedelta
-from preprocess import preprocess_price_data
+from preprocess import preprocess_price_data, is_cache_fresh
 
-def load_events(events_file):
+logger = logging.getLogger(__name__)
+
+def load_events(events_file, cache_path=None):
     """
     Load the event dates from a file.
     
@@ -12,23 +15,34 @@ def load_events(events_file):
     -----------
     events_file : str
         Path to the events file
+    cache_path : str, optional
+        Path to the Feather cache (defaults to events_file with a .feather extension)
         
     Returns:
     --------
     events_df : pandas.DataFrame
         DataFrame containing event names and dates
     """
-    events_df = pd.read_csv(events_file)
-    print(f"Loaded {len(events_df)} events")
-    
-    # Handle date ranges (some events span multiple days)
-    events_df['Event Date'] = events_df['Time of Event'].apply(
-        lambda x: x.split('–')[0] if '–' in x else x
-    )
+    if cache_path is None:
+        cache_path = os.path.splitext(events_file)[0] + '.feather'
     
-    # Clean spaces and convert to datetime
-    events_df['Event Date'] = events_df['Event Date'].str.strip()
-    events_df['Event Date'] = pd.to_datetime(events_df['Event Date'], errors='coerce')
+    if is_cache_fresh(cache_path, events_file):
+        # Reuse the parsed events from a previous run
+        events_df = pd.read_feather(cache_path)
+        print(f"Loaded {len(events_df)} events from {cache_path}")
+    else:
+        events_df = pd.read_csv(events_file, dtype={'Event name': 'string', 'Time of Event': 'string'})
+        print(f"Loaded {len(events_df)} events")
+        
+        # Take the start of date ranges (some events span multiple days) and convert
+        # to datetime; 'mixed' parsing also tolerates surrounding spaces
+        events_df['Event Date'] = pd.to_datetime(
+            events_df['Time of Event'].str.split('–', n=1).str[0],
+            errors='coerce', format='mixed'
+        )
+        
+        # Cache the parsed events
+        events_df.to_feather(cache_path)
     
     # Check for any parsing failures
     if events_df['Event Date'].isna().any():
@@ -44,106 +58,100 @@ def find_closest_trading_date(target_date, trading_dates, direction='forward'):
     -----------
     target_date : datetime
         The target date to find the closest trading date to
-    trading_dates : list
-        List of trading dates
+    trading_dates : numpy.ndarray
+        Sorted array of trading dates (datetime64[ns])
     direction : str, optional
         Direction to search ('forward' or 'backward')
         
     Returns:
     --------
-    closest_date : datetime
+    closest_date : numpy.datetime64
         The closest trading date
     """
-    # Convert trading_dates to numpy array for faster comparison
-    trading_dates_array = np.array(trading_dates)
+    # Binary search on the sorted trading dates
+    side = 'left' if direction == 'forward' else 'right'
+    i = np.searchsorted(trading_dates, np.datetime64(target_date, 'ns'), side=side)
     
     if direction == 'forward':
-        # Find the first trading date that is >= target_date
-        mask = trading_dates_array >= target_date
-        if np.any(mask):
-            return trading_dates_array[mask][0]
-        else:
-            return None
+        # First trading date that is >= target_date
+        return trading_dates[i] if i < len(trading_dates) else None
     else:  # 'backward'
-        # Find the first trading date that is <= target_date
-        mask = trading_dates_array <= target_date
-        if np.any(mask):
-            return trading_dates_array[mask][-1]
-        else:
-            return None
+        # Last trading date that is <= target_date
+        return trading_dates[i - 1] if i > 0 else None
 
 def find_trading_date_offset(base_date, trading_dates, offset):
     """
     Find a trading date that is 'offset' trading days away from the base date.
     
+    If the base date is not a trading date, the closest trading date after
+    it is used as the base.
+    
     Parameters:
     -----------
     base_date : datetime
         The base date
-    trading_dates : list
-        List of trading dates
+    trading_dates : numpy.ndarray
+        Sorted array of trading dates (datetime64[ns])
     offset : int
         Number of trading days to offset (can be positive or negative)
         
     Returns:
     --------
-    offset_date : datetime
+    offset_date : numpy.datetime64
         The date that is 'offset' trading days away from the base date
     """
-    try:
-        # Find the index of the base date in the trading dates list
-        base_idx = trading_dates.index(base_date)
-        
-        # Calculate the target index
-        target_idx = base_idx + offset
-        
-        # Check if the target index is valid
-        if 0 <= target_idx < len(trading_dates):
-            return trading_dates[target_idx]
-        else:
-            return None
-    except ValueError:
-        # Base date not found in trading dates
-        closest_date = find_closest_trading_date(base_date, trading_dates)
-        if closest_date is not None:
-            return find_trading_date_offset(closest_date, trading_dates, offset)
-        else:
-            return None
+    # Index of the base date, or of the closest trading date after it
+    base_idx = np.searchsorted(trading_dates, np.datetime64(base_date, 'ns'), side='left')
+    
+    # Calculate the target index
+    target_idx = base_idx + offset
+    
+    # Check if the target index is valid
+    if 0 <= target_idx < len(trading_dates):
+        return trading_dates[target_idx]
+    else:
+        return None
 
 def calculate_cagr(entry_price, exit_price, years):
     """
     Calculate the Compound Annual Growth Rate (CAGR).
     
+    Works element-wise on arrays, so all events and horizons can be
+    computed in a single call.
+    
     Parameters:
     -----------
-    entry_price : float
+    entry_price : float or numpy.ndarray
         The price at entry
-    exit_price : float
+    exit_price : float or numpy.ndarray
         The price at exit
-    years : float
+    years : float or numpy.ndarray
         The number of years between entry and exit
         
     Returns:
     --------
-    cagr : float
-        The CAGR as a percentage
+    cagr : numpy.ndarray
+        The CAGR as a percentage (NaN where a price or years is not positive)
     """
-    if entry_price <= 0 or exit_price <= 0 or years <= 0:
-        return None
+    entry_price = np.asarray(entry_price, dtype=np.float64)
+    exit_price = np.asarray(exit_price, dtype=np.float64)
+    years = np.asarray(years, dtype=np.float64)
     
-    cagr = (exit_price / entry_price) ** (1 / years) - 1
-    return cagr * 100  # Convert to percentage
+    valid = (entry_price > 0) & (exit_price > 0) & (years > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cagr = (exit_price / entry_price) ** (1 / years) - 1
+    return np.where(valid, cagr * 100, np.nan)  # Convert to percentage
 
-def process_events(price_data, trading_dates, events_df):
+def process_events(dates, adj_close, events_df):
     """
     Process each event and calculate CAGR for different time horizons.
     
     Parameters:
     -----------
-    price_data : pandas.DataFrame
-        Processed price data
-    trading_dates : list
-        List of trading dates
+    dates : numpy.ndarray
+        Sorted array of trading dates (datetime64[ns])
+    adj_close : numpy.ndarray
+        Adjusted close price for each trading date
     events_df : pandas.DataFrame
         DataFrame containing event names and dates
         
@@ -152,64 +160,75 @@ def process_events(price_data, trading_dates, events_df):
     results_df : pandas.DataFrame
         DataFrame containing the results
     """
-    results = []
+    n_dates = len(dates)
     
-    for idx, row in events_df.iterrows():
-        event_name = row['Event name']
-        event_date = row['Event Date']
-        
-        print(f"\nProcessing event: {event_name} ({event_date.strftime('%Y-%m-%d')})")
-        
-        # Find the closest trading date to the event date
-        closest_event_date = find_closest_trading_date(event_date, trading_dates)
-        if closest_event_date is None:
-            print(f"  No trading date found close to event date")
-            continue
-            
-        # Find entry date (event date + 2 trading days)
-        entry_date = find_trading_date_offset(closest_event_date, trading_dates, 2)
-        if entry_date is None:
-            print(f"  Not enough trading days after the event")
-            continue
-            
-        # Get entry price
-        entry_price = price_data.loc[price_data['Date'] == entry_date, 'Adj Close'].values[0]
-        print(f"  Entry date: {entry_date.strftime('%Y-%m-%d')}, Entry price: {entry_price:.2f}")
-        
-        # Initialize result row
-        result_row = {
-            'Event': event_name,
-            'Event Date': event_date.strftime('%Y-%m-%d'),
-            'Entry Date': entry_date.strftime('%Y-%m-%d'),
-            'Entry Price': entry_price
-        }
+    # Find the closest trading date on or after every event date at once
+    event_dates = events_df['Event Date'].to_numpy(dtype='datetime64[ns]')
+    event_idx = np.searchsorted(dates, event_dates, side='left')
+    
+    # Find entry dates (event date + 2 trading days), skipping events without enough data
+    entry_idx = event_idx + 2
+    has_entry = entry_idx < n_dates
+    if not has_entry.all():
+        skipped = ', '.join(events_df.loc[~has_entry, 'Event name'])
+        print(f"Skipping events without enough trading days after the event: {skipped}")
+    
+    event_names = events_df['Event name'].to_numpy()[has_entry]
+    event_dates = event_dates[has_entry]
+    entry_idx = entry_idx[has_entry]
+    entry_dates = dates[entry_idx]
+    entry_price = adj_close[entry_idx]
+    
+    # Find exit dates (entry date + years * 252 trading days) for all horizons at once
+    years = np.array([1, 3, 5])
+    exit_idx = entry_idx[:, None] + years[None, :] * 252
+    has_exit = exit_idx < n_dates
+    exit_idx = np.where(has_exit, exit_idx, n_dates - 1)
+    
+    exit_price = np.where(has_exit, adj_close[exit_idx], np.nan)
+    exit_dates = np.where(has_exit, dates[exit_idx], np.datetime64('NaT'))
+    
+    # Calculate CAGR as an (events x horizons) matrix
+    cagr = calculate_cagr(entry_price[:, None], exit_price, years)
+    
+    # Format the date columns in one pass each
+    event_dates_str = pd.DatetimeIndex(event_dates).strftime('%Y-%m-%d')
+    entry_dates_str = pd.DatetimeIndex(entry_dates).strftime('%Y-%m-%d')
+    
+    # Build the results directly from the column arrays
+    results_df = pd.DataFrame({
+        'Event': event_names,
+        'Event Date': event_dates_str,
+        'Entry Date': entry_dates_str,
+        'Entry Price': entry_price,
+        '1Y CAGR %': cagr[:, 0],
+        '3Y CAGR %': cagr[:, 1],
+        '5Y CAGR %': cagr[:, 2]
+    })
+    
+    # Per-event details are only formatted when debug logging is enabled
+    if logger.isEnabledFor(logging.DEBUG):
+        exit_dates_str = pd.DatetimeIndex(exit_dates.ravel()).strftime('%Y-%m-%d')
+        exit_dates_str = np.asarray(exit_dates_str, dtype=object).reshape(exit_dates.shape)
         
-        # Calculate CAGR for different time horizons
-        for years in [1, 3, 5]:
-            # Find exit date (entry date + years * 252 trading days)
-            exit_date = find_trading_date_offset(entry_date, trading_dates, years * 252)
-            
-            if exit_date is not None:
-                # Get exit price
-                exit_price = price_data.loc[price_data['Date'] == exit_date, 'Adj Close'].values[0]
-                
-                # Calculate CAGR
-                cagr = calculate_cagr(entry_price, exit_price, years)
-                
-                print(f"  {years}Y Exit date: {exit_date.strftime('%Y-%m-%d')}, "
-                      f"Exit price: {exit_price:.2f}, CAGR: {cagr:.2f}%")
-                
-                result_row[f'{years}Y CAGR %'] = cagr
-            else:
-                print(f"  {years}Y Exit date: Not available")
-                result_row[f'{years}Y CAGR %'] = "N/A"
-                
-        results.append(result_row)
-    
-    results_df = pd.DataFrame(results)
+        lines = []
+        for i, event_name in enumerate(event_names):
+            lines.append(f"Processing event: {event_name} ({event_dates_str[i]})")
+            lines.append(f"  Entry date: {entry_dates_str[i]}, Entry price: {entry_price[i]:.2f}")
+            for j, y in enumerate(years):
+                if has_exit[i, j]:
+                    lines.append(f"  {y}Y Exit date: {exit_dates_str[i, j]}, "
+                                 f"Exit price: {exit_price[i, j]:.2f}, CAGR: {cagr[i, j]:.2f}%")
+                else:
+                    lines.append(f"  {y}Y Exit date: Not available")
+        logger.debug('\n'.join(lines))
+    
     return results_df
 
 def main():
+    # Set LOGLEVEL=DEBUG to print the details for each event
+    logging.basicConfig(level=os.environ.get('LOGLEVEL', 'INFO'), format='%(message)s')
+    
     # Define the file paths
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     data_dir = os.path.join(base_dir, 'data')
@@ -219,21 +238,21 @@ def main():
     events_file = os.path.join(docs_dir, 'events.txt')
     
     # Preprocess the price data
-    price_data, trading_dates = preprocess_price_data(price_file)
+    dates, adj_close = preprocess_price_data(price_file)
     
     # Load the events
     events_df = load_events(events_file)
     
     # Process the events and calculate CAGR
-    results_df = process_events(price_data, trading_dates, events_df)
+    results_df = process_events(dates, adj_close, events_df)
     
     # Display the results
     print("\nResults:")
-    print(results_df)
+    print(results_df.to_string())
     
     # Save the results to a CSV file
     results_file = os.path.join(data_dir, 'cagr_results.csv')
-    results_df.to_csv(results_file, index=False)
+    results_df.to_csv(results_file, index=False, na_rep='N/A')
     print(f"\nResults saved to {results_file}")
 
 if __name__ == "__main__":
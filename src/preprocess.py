@@ -2,50 +2,82 @@ import pandas as pd
 import numpy as np
 import os
 
-def preprocess_price_data(file_path):
+def is_cache_fresh(cache_path, source_path):
+    """
+    Check whether a cache file exists and is newer than its source file.
+    
+    Parameters:
+    -----------
+    cache_path : str
+        Path to the cache file
+    source_path : str
+        Path to the file the cache was built from
+        
+    Returns:
+    --------
+    fresh : bool
+        True if the cache can be used instead of re-reading the source
+    """
+    return (os.path.exists(cache_path)
+            and os.path.getmtime(cache_path) > os.path.getmtime(source_path))
+
+def preprocess_price_data(file_path, cache_path=None):
     """
     Preprocess the price data:
-    - Convert 'Date' column to datetime format
+    - Load the 'Date' and 'Adj Close' columns, converting 'Date' to datetime format
     - Sort data by date (if not already sorted)
-    - Create a list of trading dates
+    - Cache the processed data as Parquet for later runs
+    - Split the data into plain date and price arrays
     
     Parameters:
     -----------
     file_path : str
         Path to the price data CSV file
+    cache_path : str, optional
+        Path to the Parquet cache (defaults to file_path with a .parquet extension)
         
     Returns:
     --------
-    price_data : pandas.DataFrame
-        Processed price data
-    trading_dates : list
-        List of trading dates
+    dates : numpy.ndarray
+        Sorted array of trading dates (datetime64[ns])
+    adj_close : numpy.ndarray
+        Adjusted close price for each trading date (float64)
     """
-    # Read the CSV file
-    print(f"Loading price data from {file_path}")
-    price_data = pd.read_csv(file_path)
-    
-    # Show initial data info
-    print(f"Initial data shape: {price_data.shape}")
-    print(f"Initial columns: {price_data.columns.tolist()}")
-    
-    # Convert 'Date' column to datetime format
-    price_data['Date'] = pd.to_datetime(price_data['Date'])
-    
-    # Sort by date (if not already sorted)
-    price_data.sort_values('Date', inplace=True)
+    if cache_path is None:
+        cache_path = os.path.splitext(file_path)[0] + '.parquet'
     
-    # Reset the index
-    price_data.reset_index(drop=True, inplace=True)
+    if is_cache_fresh(cache_path, file_path):
+        # Reuse the processed data from a previous run
+        print(f"Loading cached price data from {cache_path}")
+        price_data = pd.read_parquet(cache_path)
+    else:
+        # Read only the columns used downstream, parsing 'Date' to datetime on load
+        print(f"Loading price data from {file_path}")
+        price_data = pd.read_csv(file_path, engine='pyarrow', usecols=['Date', 'Adj Close'],
+                                 parse_dates=['Date'])
+        
+        # Show initial data info
+        print(f"Initial data shape: {price_data.shape}")
+        print(f"Initial columns: {price_data.columns.tolist()}")
+        
+        # Sort by date (if not already sorted)
+        price_data.sort_values('Date', inplace=True)
+        
+        # Reset the index
+        price_data.reset_index(drop=True, inplace=True)
+        
+        # Cache the processed data
+        price_data.to_parquet(cache_path, index=False)
     
-    # Create a list of trading dates
-    trading_dates = price_data['Date'].tolist()
+    # Split into plain arrays for the computation core
+    dates = price_data['Date'].to_numpy(dtype='datetime64[ns]')
+    adj_close = price_data['Adj Close'].to_numpy(dtype=np.float64)
     
     print(f"Processed data shape: {price_data.shape}")
-    print(f"Date range: {trading_dates[0]} to {trading_dates[-1]}")
-    print(f"Total trading days: {len(trading_dates)}")
+    print(f"Date range: {pd.Timestamp(dates[0])} to {pd.Timestamp(dates[-1])}")
+    print(f"Total trading days: {len(dates)}")
     
-    return price_data, trading_dates
+    return dates, adj_close
 
 if __name__ == "__main__":
     # Define the file path
@@ -53,8 +85,8 @@ if __name__ == "__main__":
     file_path = os.path.join(data_dir, 'Geopolitical Risk v S&P500 returns - s&p500 daily returns 1950-2020.csv')
     
     # Preprocess the data
-    price_data, trading_dates = preprocess_price_data(file_path)
+    dates, adj_close = preprocess_price_data(file_path)
     
     # Display some rows as a sample
     print("\nSample of processed data:")
-    print(price_data.head()) 
\ No newline at end of file
+    print(pd.DataFrame({'Date': dates, 'Adj Close': adj_close}).head()) 
\ No newline at end of file
@@ -1,4 +1,6 @@
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # Non-interactive backend, plots are only saved to files
 import matplotlib.pyplot as plt
 import numpy as np
 import os
@@ -16,14 +18,19 @@ def load_results(results_file):
     Returns:
     --------
     results_df : pandas.DataFrame
-        DataFrame containing the CAGR results
+        DataFrame containing the CAGR results, with numeric CAGR columns
+        and a datetime 'Event Date' column
     """
     print(f"Loading results from {results_file}")
-    results_df = pd.read_csv(results_file)
+    results_df = pd.read_csv(results_file, parse_dates=['Event Date'])
     print(f"Loaded results for {len(results_df)} events")
+    
+    # Convert CAGR columns to numeric once (handling non-numeric values such as 'N/A')
+    cagr_columns = [col for col in results_df.columns if 'CAGR' in col]
+    results_df[cagr_columns] = results_df[cagr_columns].apply(pd.to_numeric, errors='coerce')
     return results_df
 
-def plot_cagr_by_event(results_df, output_dir):
+def plot_cagr_by_event(results_df, ax, output_dir):
     """
     Create a bar chart of CAGR values by event.
     
@@ -31,50 +38,44 @@ def plot_cagr_by_event(results_df, output_dir):
     -----------
     results_df : pandas.DataFrame
         DataFrame containing the CAGR results
+    ax : matplotlib.axes.Axes
+        Axes to draw on (cleared after saving)
     output_dir : str
         Directory to save the plots
     """
-    # Set up the plot
-    plt.figure(figsize=(12, 8))
-    
-    # Extract CAGR columns and event names
-    cagr_columns = [col for col in results_df.columns if 'CAGR' in col]
+    # Extract event names
     events = results_df['Event']
     
-    # Convert CAGR columns to numeric (handling non-numeric values)
-    for col in cagr_columns:
-        results_df[col] = pd.to_numeric(results_df[col], errors='coerce')
-    
     # Set up bar positions
     x = np.arange(len(events))
     width = 0.25  # Width of the bars
     
     # Create bars for each time horizon
-    plt.bar(x - width, results_df['1Y CAGR %'], width, label='1 Year')
-    plt.bar(x, results_df['3Y CAGR %'], width, label='3 Years')
-    plt.bar(x + width, results_df['5Y CAGR %'], width, label='5 Years')
+    ax.bar(x - width, results_df['1Y CAGR %'], width, label='1 Year')
+    ax.bar(x, results_df['3Y CAGR %'], width, label='3 Years')
+    ax.bar(x + width, results_df['5Y CAGR %'], width, label='5 Years')
     
     # Add labels and title
-    plt.xlabel('Geopolitical Event')
-    plt.ylabel('CAGR (%)')
-    plt.title('Compound Annual Growth Rate (CAGR) After Geopolitical Events')
-    plt.xticks(x, events, rotation=45, ha='right')
-    plt.legend()
+    ax.set_xlabel('Geopolitical Event')
+    ax.set_ylabel('CAGR (%)')
+    ax.set_title('Compound Annual Growth Rate (CAGR) After Geopolitical Events')
+    ax.set_xticks(x, events, rotation=45, ha='right')
+    ax.legend()
     
     # Add a horizontal line at y=0
-    plt.axhline(y=0, color='black', linestyle='-', alpha=0.3)
+    ax.axhline(y=0, color='black', linestyle='-', alpha=0.3)
     
     # Add grid
-    plt.grid(axis='y', linestyle='--', alpha=0.3)
+    ax.grid(axis='y', linestyle='--', alpha=0.3)
     
     # Adjust layout and save
-    plt.tight_layout()
+    ax.figure.tight_layout()
     output_file = os.path.join(output_dir, 'cagr_by_event.png')
-    plt.savefig(output_file, dpi=300)
+    ax.figure.savefig(output_file, dpi=200)
     print(f"Saved plot to {output_file}")
-    plt.close()
+    ax.clear()
 
-def plot_cagr_heatmap(results_df, output_dir):
+def plot_cagr_heatmap(results_df, ax, output_dir):
     """
     Create a heatmap of CAGR values.
     
@@ -82,36 +83,38 @@ def plot_cagr_heatmap(results_df, output_dir):
     -----------
     results_df : pandas.DataFrame
         DataFrame containing the CAGR results
+    ax : matplotlib.axes.Axes
+        Axes to draw on (cleared after saving)
     output_dir : str
         Directory to save the plots
     """
-    # Set up the plot
-    plt.figure(figsize=(12, 8))
-    
     # Extract CAGR columns and event names
     cagr_columns = [col for col in results_df.columns if 'CAGR' in col]
     
     # Create a pivot table for the heatmap
     heatmap_data = results_df[['Event'] + cagr_columns].set_index('Event')
     
-    # Convert to numeric (handling non-numeric values)
-    heatmap_data = heatmap_data.apply(pd.to_numeric, errors='coerce')
-    
     # Create the heatmap
     sns.heatmap(heatmap_data, annot=True, cmap='RdYlGn', center=0, fmt='.1f', 
-                linewidths=0.5, cbar_kws={'label': 'CAGR (%)'})
+                linewidths=0.5, cbar_kws={'label': 'CAGR (%)'}, ax=ax)
     
     # Add title
-    plt.title('CAGR Heatmap by Geopolitical Event and Time Horizon')
+    ax.set_title('CAGR Heatmap by Geopolitical Event and Time Horizon')
     
     # Adjust layout and save
-    plt.tight_layout()
+    ax.figure.tight_layout()
     output_file = os.path.join(output_dir, 'cagr_heatmap.png')
-    plt.savefig(output_file, dpi=300)
+    ax.figure.savefig(output_file, dpi=200)
     print(f"Saved heatmap to {output_file}")
-    plt.close()
+    
+    # The colorbar lives in its own axes and seaborn hides the spines,
+    # undo both before reusing the figure
+    ax.collections[0].colorbar.remove()
+    ax.clear()
+    for spine in ax.spines.values():
+        spine.set_visible(True)
 
-def plot_time_series(results_df, output_dir):
+def plot_time_series(results_df, ax, output_dir):
     """
     Create a time series plot of CAGR values.
     
@@ -119,55 +122,50 @@ def plot_time_series(results_df, output_dir):
     -----------
     results_df : pandas.DataFrame
         DataFrame containing the CAGR results
+    ax : matplotlib.axes.Axes
+        Axes to draw on (cleared after saving)
     output_dir : str
         Directory to save the plots
     """
-    # Set up the plot
-    plt.figure(figsize=(12, 8))
-    
-    # Convert Event Date to datetime
-    results_df['Event Date'] = pd.to_datetime(results_df['Event Date'])
-    
     # Sort by event date
     results_df = results_df.sort_values('Event Date')
     
     # Extract CAGR columns
     cagr_columns = [col for col in results_df.columns if 'CAGR' in col]
     
-    # Convert CAGR columns to numeric (handling non-numeric values)
-    for col in cagr_columns:
-        results_df[col] = pd.to_numeric(results_df[col], errors='coerce')
-    
     # Plot each CAGR line
     for col in cagr_columns:
-        plt.plot(results_df['Event Date'], results_df[col], marker='o', linewidth=2, label=col)
+        ax.plot(results_df['Event Date'], results_df[col], marker='o', linewidth=2, label=col)
     
     # Add labels and title
-    plt.xlabel('Event Date')
-    plt.ylabel('CAGR (%)')
-    plt.title('CAGR Over Time for Different Geopolitical Events')
-    plt.grid(True, linestyle='--', alpha=0.7)
-    plt.legend()
+    ax.set_xlabel('Event Date')
+    ax.set_ylabel('CAGR (%)')
+    ax.set_title('CAGR Over Time for Different Geopolitical Events')
+    ax.grid(True, linestyle='--', alpha=0.7)
+    ax.legend()
     
     # Add annotations for each event
-    for idx, row in results_df.iterrows():
-        plt.annotate(row['Event'], 
-                     (row['Event Date'], results_df.loc[idx, '1Y CAGR %']),
-                     textcoords="offset points", 
-                     xytext=(0,10), 
-                     ha='center',
-                     fontsize=8,
-                     rotation=45)
+    names = results_df['Event'].to_numpy()
+    dates = results_df['Event Date'].to_numpy()
+    y = results_df['1Y CAGR %'].to_numpy()
+    for name, date, y_value in zip(names, dates, y):
+        ax.annotate(name, 
+                    (date, y_value),
+                    textcoords="offset points", 
+                    xytext=(0,10), 
+                    ha='center',
+                    fontsize=8,
+                    rotation=45)
     
     # Add a horizontal line at y=0
-    plt.axhline(y=0, color='black', linestyle='-', alpha=0.3)
+    ax.axhline(y=0, color='black', linestyle='-', alpha=0.3)
     
     # Adjust layout and save
-    plt.tight_layout()
+    ax.figure.tight_layout()
     output_file = os.path.join(output_dir, 'cagr_time_series.png')
-    plt.savefig(output_file, dpi=300)
+    ax.figure.savefig(output_file, dpi=200)
     print(f"Saved time series plot to {output_file}")
-    plt.close()
+    ax.clear()
 
 def main():
     # Define the file paths
@@ -182,10 +180,12 @@ def main():
     results_file = os.path.join(data_dir, 'cagr_results.csv')
     results_df = load_results(results_file)
     
-    # Generate plots
-    plot_cagr_by_event(results_df, output_dir)
-    plot_cagr_heatmap(results_df, output_dir)
-    plot_time_series(results_df, output_dir)
+    # Generate plots, reusing a single figure
+    fig, ax = plt.subplots(figsize=(12, 8))
+    plot_cagr_by_event(results_df, ax, output_dir)
+    plot_cagr_heatmap(results_df, ax, output_dir)
+    plot_time_series(results_df, ax, output_dir)
+    plt.close(fig)
     
     print("Visualization complete!")
 